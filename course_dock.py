@@ -1,11 +1,34 @@
 from __future__ import annotations
 
+from html import escape
 from typing import Optional
 
 import pandas as pd
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QDockWidget, QTextBrowser
 
+_TABLE_OPEN = "<h3>Course information</h3><table style='width:100%; border-collapse: collapse;'>"
+_ROW_TEMPLATE = (
+    "<tr>"
+    "<th style='text-align:left; padding:4px; border-bottom:1px solid #ccc;'>{}</th>"
+    "<td style='padding:4px; border-bottom:1px solid #ccc;'>{}</td>"
+    "</tr>"
+).format
+
+
+def value_text(value: object) -> str:
+    """Render a record field as dock text; NA values become blank."""
+    # None and Python floats (the common fields) skip pd.isna(); other scalars
+    # such as np.float32 or datetime64 NaT still go through it. Lists/dicts
+    # stringify as-is.
+    if value is None:
+        return ""
+    if value.__class__ is float:
+        return "" if value != value else str(value)
+    if not isinstance(value, (list, dict)) and pd.isna(value):
+        return ""
+    return str(value)
+
 
 class CourseInfoDock(QDockWidget):
     """Dock widget that displays course metadata."""
@@ -25,19 +48,8 @@ class CourseInfoDock(QDockWidget):
             self.clear()
             return
 
-        html_parts = ["<h3>Course information</h3>", "<table style='width:100%; border-collapse: collapse;'>"]
-        for column, value in course_row.items():
-            if isinstance(value, (list, dict)):
-                value_str = str(value)
-            elif pd.isna(value):
-                value_str = ""
-            else:
-                value_str = str(value)
-            html_parts.append(
-                "<tr>"
-                f"<th style='text-align:left; padding:4px; border-bottom:1px solid #ccc;'>{column}</th>"
-                f"<td style='padding:4px; border-bottom:1px solid #ccc;'>{value_str}</td>"
-                "</tr>"
-            )
-        html_parts.append("</table>")
-        self._browser.setHtml("\n".join(html_parts))
\ No newline at end of file
+        rows_html = "".join(
+            _ROW_TEMPLATE(escape(str(column)), escape(value_text(value)))
+            for column, value in zip(course_row.index, course_row.to_numpy(dtype=object))
+        )
+        self._browser.setHtml(f"{_TABLE_OPEN}{rows_html}</table>")
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import json
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple
 
-import json
+import numpy as np
 import pandas as pd
 
-from filter_dialog import FilterCriterion
+try:  # optional: orjson decodes the kwalificaties blobs considerably faster
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+if TYPE_CHECKING:  # the dialog module pulls in the Qt widget stack
+    from filter_dialog import FilterCriterion
 
 __all__ = [
     "CourseDataModel",
@@ -18,6 +25,12 @@ __all__ = [
 ]
 
 
+FilterPredicate = Callable[[pd.DataFrame], np.ndarray]
+FilterKey = Tuple[str, str, Tuple[str, ...], str]
+
+_NAT_I8 = np.iinfo(np.int64).min
+
+
 # ---------------------------------------------------------------------------
 # Data containers
 # ---------------------------------------------------------------------------
@@ -27,14 +40,26 @@ __all__ = [
 class StudentDescriptor:
     identifier: str
     label: str
-    rows: pd.DataFrame
+    frame: pd.DataFrame
+    row_indices: np.ndarray
+
+    @property
+    def rows(self) -> pd.DataFrame:
+        return self.frame.take(self.row_indices)
 
 
 @dataclass
 class CourseDescriptor:
     qid: str
     label: str
-    course_row: Optional[pd.Series]
+    frame: Optional[pd.DataFrame]
+    row_index: Optional[int]
+
+    @property
+    def course_row(self) -> Optional[pd.Series]:
+        if self.frame is None or self.row_index is None:
+            return None
+        return self.frame.iloc[self.row_index]
 
 
 @dataclass
@@ -42,14 +67,28 @@ class CellDescriptor:
     student: StudentDescriptor
     course: CourseDescriptor
     completion_date: Optional[pd.Timestamp]
-    student_rows: pd.DataFrame
+    frame: pd.DataFrame
+    row_indices: np.ndarray
+
+    @property
+    def student_rows(self) -> pd.DataFrame:
+        return self.frame.take(self.row_indices)
 
 
 @dataclass
 class MatrixData:
     students: List[StudentDescriptor]
     courses: List[CourseDescriptor]
-    cell_lookup: Dict[Tuple[int, int], CellDescriptor]
+    # Dense (students x courses) grids: the cell descriptor (or None) and the
+    # latest completion as int64 ticks of completion_unit (_NAT_I8 when missing).
+    cells: np.ndarray = field(default_factory=lambda: np.empty((0, 0), dtype=object))
+    completion_i8: np.ndarray = field(default_factory=lambda: np.empty((0, 0), dtype=np.int64))
+    completion_unit: str = "ns"
+
+    @property
+    def completion(self) -> np.ndarray:
+        """The completion grid as datetime64 values (NaT when missing)."""
+        return self.completion_i8.view(f"datetime64[{self.completion_unit}]")
 
     @property
     def is_empty(self) -> bool:
@@ -61,8 +100,25 @@ class MatrixData:
 # ---------------------------------------------------------------------------
 
 
-def _has_key(store: pd.HDFStore, name: str) -> bool:
-    return any(k.lstrip("/") == name for k in store.keys())
+def _decode_json(text: str | bytes) -> object:
+    # orjson is strict JSON: it rejects the NaN/Infinity tokens json.dumps
+    # writes (and, in some versions, integers wider than 64 bits), so blobs
+    # it cannot decode are retried with json.loads.
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
+
+def read_students_excel(path: str | Path) -> pd.DataFrame:
+    # python-calamine is an optional, much faster reader (pandas >= 2.2);
+    # fall back to pandas' default engine when it is unavailable.
+    try:
+        return pd.read_excel(path, engine="calamine")
+    except (ImportError, ValueError):
+        return pd.read_excel(path)
 
 
 def load_courses_from_hdf5(path: str | Path) -> Tuple[pd.DataFrame, pd.DataFrame]:
@@ -73,29 +129,72 @@ def load_courses_from_hdf5(path: str | Path) -> Tuple[pd.DataFrame, pd.DataFrame
     with pd.HDFStore(path, mode="r") as store:
         courses_df = store["courses"]
         kwalificaties_df = store["kwalificaties"]
-
-        if "ot_product_id" in courses_df.columns:
-            courses_df["ot_product_id"] = courses_df["ot_product_id"].astype(str)
-        if "ot_product_id" in kwalificaties_df.columns:
-            kwalificaties_df["ot_product_id"] = kwalificaties_df["ot_product_id"].astype(str)
-
-        if _has_key(store, "kwalificaties_json"):
-            kval_json = store["kwalificaties_json"]
-            if "ot_product_id" in kval_json.columns:
-                kval_json["ot_product_id"] = kval_json["ot_product_id"].astype(str)
-            kval_json["kwalificaties"] = kval_json["kwalificaties_json"].apply(
-                lambda s: None
-                if s is None or (isinstance(s, float) and pd.isna(s))
-                else json.loads(s)
-            )
-            kval_json = kval_json[["ot_product_id", "kwalificaties"]]
-            courses_df = courses_df.merge(kval_json, on="ot_product_id", how="left")
-        else:
-            courses_df["kwalificaties"] = None
+        # Probe the optional key directly; store.keys() walks every node in the file.
+        try:
+            kval_json: Optional[pd.DataFrame] = store["kwalificaties_json"]
+        except KeyError:
+            kval_json = None
+
+    if "ot_product_id" in courses_df.columns:
+        courses_df["ot_product_id"] = courses_df["ot_product_id"].astype(str)
+    if "ot_product_id" in kwalificaties_df.columns:
+        kwalificaties_df["ot_product_id"] = kwalificaties_df["ot_product_id"].astype(str)
+
+    if kval_json is not None:
+        if "ot_product_id" in kval_json.columns:
+            kval_json["ot_product_id"] = kval_json["ot_product_id"].astype(str)
+        raw = kval_json["kwalificaties_json"].to_numpy(dtype=object)
+        kval_json["kwalificaties"] = pd.Series(
+            [None if s is None or (isinstance(s, float) and s != s) else _decode_json(s) for s in raw],
+            index=kval_json.index,
+            dtype=object,
+        )
+        kval_json = kval_json[["ot_product_id", "kwalificaties"]]
+        courses_df = courses_df.merge(kval_json, on="ot_product_id", how="left")
+    else:
+        courses_df["kwalificaties"] = None
 
     return courses_df, kwalificaties_df
 
 
+# ---------------------------------------------------------------------------
+# Array kernels for matrix construction
+# ---------------------------------------------------------------------------
+
+
+def _positions_in(series: pd.Series, keys: List[str]) -> np.ndarray:
+    """Map every value of ``series`` to its position in ``keys`` (-1 if absent)."""
+    codes, uniques = pd.factorize(series)
+    if not len(uniques):
+        return np.full(len(codes), -1, dtype=np.intp)
+    positions = pd.Index(keys).get_indexer(pd.Index(uniques).astype(str))
+    return np.where(codes >= 0, positions[codes], -1)
+
+
+def _max_completion_by_cell(
+    student_pos: np.ndarray, course_pos: np.ndarray, completion_i8: np.ndarray, n_courses: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Reduce rows by (student, course) cell with a single stable sort.
+
+    Returns the flat cell keys, the latest completion per cell as int64
+    ticks (``_NAT_I8`` when every row is NaT), the sorted row positions
+    and the offsets at which each cell's rows start within them.
+    """
+    rows = np.flatnonzero((student_pos >= 0) & (course_pos >= 0))
+    cell_keys = student_pos[rows] * n_courses + course_pos[rows]
+    order = np.argsort(cell_keys, kind="stable")
+    rows = rows[order]
+    cell_keys = cell_keys[order]
+    if not len(rows):
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, rows, empty
+
+    starts = np.flatnonzero(np.r_[True, cell_keys[1:] != cell_keys[:-1]])
+    # NaT is the smallest int64, so it only survives the max when a cell has no dates.
+    latest = np.maximum.reduceat(completion_i8[rows], starts)
+    return cell_keys[starts], latest, rows, starts
+
+
 # ---------------------------------------------------------------------------
 # Main data model
 # ---------------------------------------------------------------------------
@@ -143,9 +242,13 @@ class CourseDataModel:
         self.student_name_column: Optional[str] = None
         self.qid_column: Optional[str] = None
         self.completion_column: Optional[str] = None
-        self.course_lookup_by_qid: Dict[str, pd.Series] = {}
-        self.matrix_data: MatrixData = MatrixData([], [], {})
+        self._course_row_idx_by_qid: Dict[str, int] = {}
+        self._course_label_by_qid: Dict[str, str] = {}
+        self._courses_row_cache: Dict[str, pd.Series] = {}
+        self.matrix_data: MatrixData = MatrixData([], [])
         self.filters: list[FilterCriterion] = []
+        self._compiled_filters: list[Tuple[FilterKey, FilterPredicate]] = []
+        self._mask_cache: Dict[Tuple[int, FilterKey], np.ndarray] = {}
     # ------------------------------------------------------------------
     # Loading routines
     # ------------------------------------------------------------------
@@ -155,7 +258,7 @@ class CourseDataModel:
         if not path.exists():
             raise FileNotFoundError(path)
 
-        df = pd.read_excel(path)
+        df = read_students_excel(path)
         if df.empty:
             raise ValueError("The provided Excel file does not contain any rows.")
 
@@ -185,11 +288,15 @@ class CourseDataModel:
         self.student_name_column = self._detect_column(df.columns, self.STUDENT_NAME_CANDIDATES)
 
         df[self.completion_column] = pd.to_datetime(df[self.completion_column], errors="coerce")
-        df[self.qid_column] = df[self.qid_column].astype(str)
-        df[self.student_id_column] = df[self.student_id_column].astype(str)
+        # The id columns are grouped and filtered on repeatedly; categorical codes
+        # make both much cheaper than hashing Python strings per row.
+        df[self.qid_column] = df[self.qid_column].astype(str).astype("category")
+        df[self.student_id_column] = df[self.student_id_column].astype(str).astype("category")
 
-        self.matrix_data = MatrixData([], [], {})
-        self.filters = []        
+        self.matrix_data = MatrixData([], [])
+        self.filters = []
+        self._compiled_filters = []
+        self._mask_cache.clear()
 
     def load_courses(self, path: str | Path) -> None:
         courses_df, kwalificaties_df = load_courses_from_hdf5(path)
@@ -199,7 +306,8 @@ class CourseDataModel:
         self.courses_df = courses_df
         self.kwalificaties_df = kwalificaties_df
         self._build_course_lookup()
-        self.matrix_data = MatrixData([], [], {})
+        self._build_course_labels()
+        self.matrix_data = MatrixData([], [])
 
     # ------------------------------------------------------------------
     # Matrix construction
@@ -207,70 +315,80 @@ class CourseDataModel:
 
     def build_matrix(self) -> MatrixData:
         if self.students_df is None or self.courses_df is None:
-            self.matrix_data = MatrixData([], [], {})
+            self.matrix_data = MatrixData([], [])
             return self.matrix_data
 
         students_df = self._apply_filters(self.students_df)
 
+        # Descriptors keep positional indices into students_df rather than copies.
+        has_name = bool(self.student_name_column) and self.student_name_column in students_df.columns
+        row_indices_by_student = students_df.groupby(self.student_id_column, observed=True).indices
         students: List[StudentDescriptor] = []
-        for _, student_rows in students_df.groupby(self.student_id_column):
-            student_id = str(student_rows[self.student_id_column].iloc[0])
-            if self.student_name_column and self.student_name_column in student_rows.columns:
-                name_value = student_rows[self.student_name_column].iloc[0]
+        for student_id in sorted(row_indices_by_student, key=str):
+            row_indices = row_indices_by_student[student_id]
+            student_id = str(student_id)
+            if has_name:
+                name_value = students_df[self.student_name_column].iat[row_indices[0]]
                 label = f"{name_value} ({student_id})"
             else:
                 label = student_id
-            students.append(StudentDescriptor(student_id, label, student_rows.copy()))
+            students.append(StudentDescriptor(student_id, label, students_df, row_indices))
 
         if not students:
-            self.matrix_data = MatrixData([], [], {})
+            self.matrix_data = MatrixData([], [])
             return self.matrix_data
 
-        unique_qids = (
-            students_df[self.qid_column]
-            .dropna()
-            .astype(str)
-            .unique()
-            .tolist()
-        )
-        unique_qids.sort()
+        qids = students_df[self.qid_column]
+        if isinstance(qids.dtype, pd.CategoricalDtype):
+            # Categories built by astype("category") are already sorted; keep the observed ones.
+            codes = qids.cat.codes.to_numpy()
+            observed = qids.cat.categories[np.unique(codes[codes >= 0])]
+            unique_qids = [str(qid) for qid in observed]
+        else:
+            unique_qids = np.unique(qids.dropna().astype(str).to_numpy()).tolist()
 
         courses: List[CourseDescriptor] = []
         for qid in unique_qids:
-            course_row = self.course_lookup_by_qid.get(str(qid))
-            label = self._course_label(course_row, qid)
-            courses.append(CourseDescriptor(str(qid), label, None if course_row is None else course_row.copy()))
+            row_index = self._course_row_idx_by_qid.get(str(qid))
+            label = self._course_label_by_qid.get(str(qid), str(qid))
+            courses.append(CourseDescriptor(str(qid), label, self.courses_df, row_index))
 
         if not courses:
-            self.matrix_data = MatrixData(students, [], {})
+            self.matrix_data = MatrixData(students, [])
             return self.matrix_data
 
-        course_index_by_qid = {course.qid: idx for idx, course in enumerate(courses)}
+        student_pos = _positions_in(students_df[self.student_id_column], [s.identifier for s in students])
+        course_pos = _positions_in(students_df[self.qid_column], [c.qid for c in courses])
+        # Reduce in the column's own unit: casting e.g. datetime64[us] to [ns]
+        # silently wraps dates outside 1677-2262.
+        completion_values = students_df[self.completion_column].to_numpy()
+        if completion_values.dtype.kind != "M":
+            completion_values = completion_values.astype("datetime64[ns]")
+        completion_unit = np.datetime_data(completion_values.dtype)[0]
+        completion_i8 = completion_values.view("i8")
+        cell_keys, latest, rows, starts = _max_completion_by_cell(
+            student_pos, course_pos, completion_i8, len(courses)
+        )
 
-        cell_lookup: Dict[Tuple[int, int], CellDescriptor] = {}
-        for row_index, student in enumerate(students):
-            if self.qid_column not in student.rows:
-                continue
-            grouped = student.rows.groupby(self.qid_column)
-            for qid, rows in grouped:
-                qid = str(qid)
-                column_index = course_index_by_qid.get(qid)
-                if column_index is None:
-                    continue
-                course = courses[column_index]
-                completion_series = pd.to_datetime(rows[self.completion_column], errors="coerce")
-                completion_date: Optional[pd.Timestamp]
-                completion_date = None
-                if not completion_series.isna().all():
-                    completion_date = completion_series.max()
-                cell_lookup[(row_index, column_index)] = CellDescriptor(
-                    student=student,
-                    course=course,
-                    completion_date=completion_date,
-                    student_rows=rows.copy(),
-                )
-
-        self.matrix_data = MatrixData(students, courses, cell_lookup)
+        n_students, n_courses = len(students), len(courses)
+        completion_grid = np.full((n_students, n_courses), _NAT_I8, dtype=np.int64)
+        completion_grid.flat[cell_keys] = latest
+
+        cells = np.empty((n_students, n_courses), dtype=object)
+        stops = np.r_[starts[1:], len(rows)]
+        for cell_key, completion, start, stop in zip(cell_keys.tolist(), latest.tolist(), starts, stops):
+            row_index, column_index = divmod(cell_key, n_courses)
+            cells[row_index, column_index] = CellDescriptor(
+                student=students[row_index],
+                course=courses[column_index],
+                completion_date=(
+                    None if completion == _NAT_I8 else pd.Timestamp(np.datetime64(completion, completion_unit))
+                ),
+                frame=students_df,
+                row_indices=rows[start:stop],
+            )
+
+        self.matrix_data = MatrixData(students, courses, cells, completion_grid, completion_unit)
         return self.matrix_data
 
     # ------------------------------------------------------------------
@@ -279,17 +397,32 @@ class CourseDataModel:
 
     def set_filters(self, filters: list[FilterCriterion]) -> None:
         self.filters = filters
+        self._compiled_filters = []
+        for criterion in filters:
+            predicate = self._compile_filter(criterion)
+            if predicate is not None:
+                self._compiled_filters.append((self._filter_key(criterion), predicate))
         # Reset cached matrix so it is rebuilt on demand
-        self.matrix_data = MatrixData([], [], {})
+        self.matrix_data = MatrixData([], [])
 
 
     def get_cell(self, row: int, column: int) -> Optional[CellDescriptor]:
-        if not self.matrix_data.cell_lookup:
+        n_rows, n_columns = self.matrix_data.cells.shape
+        if not (0 <= row < n_rows and 0 <= column < n_columns):
             return None
-        return self.matrix_data.cell_lookup.get((row, column))
+        return self.matrix_data.cells[row, column]
 
     def get_course_by_qid(self, qid: str) -> Optional[pd.Series]:
-        return self.course_lookup_by_qid.get(str(qid))
+        qid = str(qid)
+        course_row = self._courses_row_cache.get(qid)
+        if course_row is not None:
+            return course_row
+        row_index = self._course_row_idx_by_qid.get(qid)
+        if row_index is None or self.courses_df is None:
+            return None
+        course_row = self.courses_df.iloc[row_index]
+        self._courses_row_cache[qid] = course_row
+        return course_row
 
     # ------------------------------------------------------------------
     # Internal helpers
@@ -307,98 +440,151 @@ class CourseDataModel:
         return None
 
     def _build_course_lookup(self) -> None:
-        self.course_lookup_by_qid.clear()
-        if self.courses_df is None:
+        self._course_row_idx_by_qid.clear()
+        self._courses_row_cache.clear()
+        if self.courses_df is None or "kwalificaties" not in self.courses_df.columns:
             return
 
-        for _, row in self.courses_df.iterrows():
-            kwalificaties = row.get("kwalificaties")
-            if isinstance(kwalificaties, list):
-                for kwal in kwalificaties:
-                    if isinstance(kwal, dict):
-                        qid = kwal.get("Kwal. ID") or kwal.get("Kwalificatie ID") or kwal.get("kwalificatie_id")
-                        if qid is not None:
-                            self.course_lookup_by_qid[str(qid)] = row
+        # Only the object column is walked; rows are resolved lazily by position.
+        lookup = self._course_row_idx_by_qid
+        kwals = self.courses_df["kwalificaties"].to_numpy(dtype=object)
+        for i, kwalificaties in enumerate(kwals):
+            if kwalificaties.__class__ is not list:
+                continue
+            for kwal in kwalificaties:
+                if isinstance(kwal, dict):
+                    qid = kwal.get("Kwal. ID") or kwal.get("Kwalificatie ID") or kwal.get("kwalificatie_id")
+                    if qid is not None:
+                        lookup[str(qid)] = i
+
+    def _build_course_labels(self) -> None:
+        self._course_label_by_qid.clear()
+        if self.courses_df is None or not self._course_row_idx_by_qid:
+            return
 
-    @staticmethod
-    def _course_label(course_row: Optional[pd.Series], qid: str) -> str:
-        if course_row is None:
-            return str(qid)
+        # First non-blank string among the candidate columns, resolved column-wise.
+        labels: Optional[pd.Series] = None
         for candidate in ("naam", "name", "course_name", "title"):
-            if candidate in course_row.index:
-                value = course_row[candidate]
-                if isinstance(value, str) and value.strip():
-                    return f"{value} ({qid})"
-        return str(qid)
-    
+            if candidate not in self.courses_df.columns:
+                continue
+            values = self.courses_df[candidate].reset_index(drop=True)
+            try:
+                stripped = values.str.strip()
+            except AttributeError:  # no string values in this column
+                continue
+            values = values.where(stripped.notna() & stripped.ne(""))
+            labels = values if labels is None else labels.combine_first(values)
+        if labels is None:
+            return
+
+        label_values = labels.to_numpy(dtype=object)
+        for qid, row_index in self._course_row_idx_by_qid.items():
+            value = label_values[row_index]
+            if isinstance(value, str):
+                self._course_label_by_qid[qid] = f"{value} ({qid})"
+
     def _apply_filters(self, df: pd.DataFrame) -> pd.DataFrame:
-        if not self.filters:
+        if not self._compiled_filters:
             return df
 
-        filtered = df
-        for criterion in self.filters:
-            if criterion.column not in filtered.columns:
-                continue
+        # AND every mask into one buffer and gather the frame exactly once.
+        combined = np.ones(len(df), dtype=bool)
+        cacheable = df is self.students_df
+        for key, predicate in self._compiled_filters:
+            # Masks survive set_filters, so toggling one filter only evaluates that one.
+            cache_key = (id(df), key)
+            mask = self._mask_cache.get(cache_key) if cacheable else None
+            if mask is None:
+                mask = predicate(df)
+                if cacheable:
+                    self._mask_cache[cache_key] = mask
+            combined &= mask
+        if combined.all():
+            return df
+        return df[combined]
+
+    @staticmethod
+    def _cast_filter_series(series: pd.Series, value_type: str) -> pd.Series:
+        if value_type == "categorical":
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                return series
+            return series.astype(str)
+        if value_type == "date":
+            # The completion column is parsed at load time; don't parse it again.
+            if pd.api.types.is_datetime64_any_dtype(series):
+                return series
+            return pd.to_datetime(series, errors="coerce")
+        return pd.to_numeric(series, errors="coerce")
+
+    def _compile_filter(self, criterion: FilterCriterion) -> Optional[FilterPredicate]:
+        """Turn a criterion into a mask function over a cast students column.
+
+        The column is cast on first use and reused afterwards.
+
+        Returns ``None`` for criteria that would not filter anything (unknown
+        column, no usable values), mirroring how they were skipped before.
+        """
+        if self.students_df is None or criterion.column not in self.students_df.columns:
+            return None
+
+        compare: Callable[[pd.Series], object]
+        if criterion.value_type == "categorical":
+            values = [str(v) for v in criterion.values if pd.notna(v)]
+            if not values:
+                return None
+            wanted = values[:1] if criterion.operator in ("is", "is not") else values
+            if criterion.operator in ("is not", "not in"):
+                compare = lambda s: ~self._categorical_isin(s, wanted)
+            else:  # is / in
+                compare = lambda s: self._categorical_isin(s, wanted)
+        else:
+            if not criterion.values:
+                return None
+            parse = pd.to_datetime if criterion.value_type == "date" else pd.to_numeric
+            start = parse(criterion.values[0], errors="coerce")
+            end = parse(criterion.values[1], errors="coerce") if len(criterion.values) > 1 else None
+            if pd.isna(start):
+                return None
+            if criterion.operator == "between" and end is not None and not pd.isna(end):
+                compare = lambda s: (s >= start) & (s <= end)
+            elif criterion.operator == "≠":
+                compare = lambda s: s != start
+            elif criterion.operator == "<":
+                compare = lambda s: s < start
+            elif criterion.operator == "≤":
+                compare = lambda s: s <= start
+            elif criterion.operator == ">":
+                compare = lambda s: s > start
+            elif criterion.operator == "≥":
+                compare = lambda s: s >= start
+            else:
+                compare = lambda s: s == start
 
-            series = filtered[criterion.column]
-            if criterion.value_type == "categorical":
-                values = [str(v) for v in criterion.values if pd.notna(v)]
-                if not values:
-                    continue
-                series_str = series.astype(str)
-                if criterion.operator == "is":
-                    mask = series_str == values[0]
-                elif criterion.operator == "is not":
-                    mask = series_str != values[0]
-                elif criterion.operator == "not in":
-                    mask = ~series_str.isin(values)
-                else:  # in
-                    mask = series_str.isin(values)
-            elif criterion.value_type == "date":
-                series_dt = pd.to_datetime(series, errors="coerce")
-                if not criterion.values:
-                    continue
-                start = pd.to_datetime(criterion.values[0], errors="coerce")
-                end = pd.to_datetime(criterion.values[1], errors="coerce") if len(criterion.values) > 1 else None
-                if pd.isna(start):
-                    continue
-                if criterion.operator == "between" and end is not None and not pd.isna(end):
-                    mask = (series_dt >= start) & (series_dt <= end)
-                elif criterion.operator == "≠":
-                    mask = series_dt != start
-                elif criterion.operator == "<":
-                    mask = series_dt < start
-                elif criterion.operator == "≤":
-                    mask = series_dt <= start
-                elif criterion.operator == ">":
-                    mask = series_dt > start
-                elif criterion.operator == "≥":
-                    mask = series_dt >= start
-                else:
-                    mask = series_dt == start
-            else:  # numeric
-                numeric_series = pd.to_numeric(series, errors="coerce")
-                if not criterion.values:
-                    continue
-                start = pd.to_numeric(criterion.values[0], errors="coerce")
-                end = pd.to_numeric(criterion.values[1], errors="coerce") if len(criterion.values) > 1 else None
-                if pd.isna(start):
-                    continue
-                if criterion.operator == "between" and end is not None and not pd.isna(end):
-                    mask = (numeric_series >= start) & (numeric_series <= end)
-                elif criterion.operator == "≠":
-                    mask = numeric_series != start
-                elif criterion.operator == "<":
-                    mask = numeric_series < start
-                elif criterion.operator == "≤":
-                    mask = numeric_series <= start
-                elif criterion.operator == ">":
-                    mask = numeric_series > start
-                elif criterion.operator == "≥":
-                    mask = numeric_series >= start
-                else:
-                    mask = numeric_series == start
-
-            filtered = filtered[mask]
-
-        return filtered    
\ No newline at end of file
+        source = self.students_df
+        column = criterion.column
+        value_type = criterion.value_type
+        cast: Optional[pd.Series] = None
+
+        def predicate(df: pd.DataFrame) -> np.ndarray:
+            nonlocal cast
+            if df is not source:
+                series = self._cast_filter_series(df[column], value_type)
+            else:
+                if cast is None:
+                    cast = self._cast_filter_series(source[column], value_type)
+                series = cast
+            return np.asarray(compare(series), dtype=bool)
+
+        return predicate
+
+    @staticmethod
+    def _filter_key(criterion: FilterCriterion) -> FilterKey:
+        values = tuple(str(v) for v in criterion.values)
+        return (criterion.column, criterion.operator, values, criterion.value_type)
+
+    @staticmethod
+    def _categorical_isin(series: pd.Series, values: List[str]) -> np.ndarray:
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            target_codes = series.cat.categories.get_indexer(values)
+            return np.isin(series.cat.codes.to_numpy(), target_codes[target_codes >= 0])
+        return series.isin(values).to_numpy()
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Literal, Optional
+from typing import Dict, Iterable, List, Literal, Optional, Tuple
 
 import pandas as pd
-from PyQt5.QtCore import QDate
+from PyQt5.QtCore import QDate, QTimer
 from PyQt5.QtWidgets import (
     QComboBox,
     QDateEdit,
@@ -18,6 +18,7 @@ from PyQt5.QtWidgets import (
     QLineEdit,
     QListWidget,
     QListWidgetItem,
+    QPlainTextEdit,
     QPushButton,
     QVBoxLayout,
     QWidget,
@@ -52,21 +53,32 @@ class MultiSelectWidget(QWidget):
         self.list_widget = QListWidget(self)
         layout.addWidget(self.list_widget)
         self._all_items: List[str] = []
+        self._lower_items: List[str] = []
+
+        # Typing bursts are coalesced into a single pass over the list.
+        self._pending_text = ""
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(80)
+        self._filter_timer.timeout.connect(self._run_filter)
 
     def set_values(self, values: Iterable[object]) -> None:
         self.list_widget.clear()
         self._all_items = ["" if pd.isna(v) else str(v) for v in values]
+        self._lower_items = [value.lower() for value in self._all_items]
         for value in self._all_items:
             item = QListWidgetItem(value)
             item.setCheckState(0)
             self.list_widget.addItem(item)
 
     def _apply_filter(self, text: str) -> None:
-        text_lower = text.lower().strip()
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            visible = text_lower in item.text().lower()
-            item.setHidden(not visible)
+        self._pending_text = text.lower().strip()
+        self._filter_timer.start()
+
+    def _run_filter(self) -> None:
+        text_lower = self._pending_text
+        for i, value_lower in enumerate(self._lower_items):
+            self.list_widget.item(i).setHidden(text_lower not in value_lower)
 
     def selected_values(self) -> List[str]:
         values: List[str] = []
@@ -83,6 +95,30 @@ class MultiSelectWidget(QWidget):
             item.setCheckState(2 if item.text() in selected else 0)
 
 
+class TextListInput(QWidget):
+    """Free-text categorical input for columns with too many values to list."""
+
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        # One value per line: values in these (mostly name/free-text) columns
+        # can themselves contain commas.
+        self.text_edit = QPlainTextEdit(self)
+        self.text_edit.setPlaceholderText(
+            "One value per line; commas are kept (e.g. Jansen, P.).\n'is'/'is not' use the first line."
+        )
+        self.text_edit.setLineWrapMode(QPlainTextEdit.NoWrap)
+        layout.addWidget(self.text_edit)
+
+    def selected_values(self) -> List[str]:
+        return [value.strip() for value in self.text_edit.toPlainText().splitlines() if value.strip()]
+
+    def set_selected_values(self, values: Iterable[str]) -> None:
+        self.text_edit.setPlainText("\n".join(values))
+
+
 class NumericInput(QWidget):
     """Numeric input supporting single value or ranges."""
 
@@ -189,6 +225,9 @@ class FilterRowWidget(QFrame):
         self.value_container.setContentsMargins(0, 0, 0, 0)
         self.value_container.setSpacing(0)
         self.value_widget: Optional[QWidget] = None
+        # Value widgets are kept per (column, kind, range) so switching back to a
+        # column does not rebuild (possibly huge) value lists.
+        self._widget_pool: Dict[Tuple[str, ValueKind, bool], QWidget] = {}
 
         placeholder = QWidget(self)
         placeholder.setLayout(self.value_container)
@@ -211,19 +250,27 @@ class FilterRowWidget(QFrame):
     def _update_value_widget(self, value_type: ValueKind) -> None:
         if self.value_widget is not None:
             self.value_container.removeWidget(self.value_widget)
-            self.value_widget.deleteLater()
+            self.value_widget.hide()
             self.value_widget = None
 
-        allow_range = self.operator_combo.currentText() == "between"
-        if value_type == "categorical":
-            widget = MultiSelectWidget(self)
-            widget.set_values(self.values_by_column.get(self.column_combo.currentText(), []))
-        elif value_type == "date":
-            widget = DateInput(allow_range, self)
-        else:
-            widget = NumericInput(allow_range, self)
+        column = self.column_combo.currentText()
+        allow_range = value_type != "categorical" and self.operator_combo.currentText() == "between"
+        key = (column, value_type, allow_range)
+        widget = self._widget_pool.get(key)
+        if widget is None:
+            if value_type == "categorical" and column not in self.values_by_column:
+                widget = TextListInput(self)
+            elif value_type == "categorical":
+                widget = MultiSelectWidget(self)
+                widget.set_values(self.values_by_column[column])
+            elif value_type == "date":
+                widget = DateInput(allow_range, self)
+            else:
+                widget = NumericInput(allow_range, self)
+            self._widget_pool[key] = widget
 
         self.value_container.addWidget(widget)
+        widget.show()
         self.value_widget = widget
 
     def _on_operator_changed(self, operator: str) -> None:
@@ -241,7 +288,7 @@ class FilterRowWidget(QFrame):
         value_type = self.columns[column]
         operator = self.operator_combo.currentText()
 
-        if isinstance(self.value_widget, MultiSelectWidget):
+        if isinstance(self.value_widget, (MultiSelectWidget, TextListInput)):
             values = self.value_widget.selected_values()
         elif isinstance(self.value_widget, NumericInput):
             values = self.value_widget.values()
@@ -258,7 +305,7 @@ class FilterRowWidget(QFrame):
         if criterion.operator in self.CATEGORICAL_OPERATORS + self.NUMERIC_OPERATORS:
             self.operator_combo.setCurrentText(criterion.operator)
         self._on_operator_changed(self.operator_combo.currentText())
-        if isinstance(self.value_widget, MultiSelectWidget):
+        if isinstance(self.value_widget, (MultiSelectWidget, TextListInput)):
             self.value_widget.set_selected_values([str(v) for v in criterion.values])
         elif isinstance(self.value_widget, NumericInput):
             numeric_values = [float(v) for v in criterion.values]
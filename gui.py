@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Optional
+from typing import Tuple
 
+import numpy as np
 import pandas as pd
-from PyQt5.QtCore import QEvent, QItemSelection, QModelIndex, Qt
-from PyQt5.QtGui import QColor, QBrush
+from PyQt5.QtCore import QAbstractTableModel, QEvent, QItemSelection, QModelIndex, Qt, QTimer
+from PyQt5.QtGui import QColor, QBrush, QFontMetrics
 from PyQt5.QtWidgets import (
     QApplication,
     QFileDialog,
@@ -22,100 +23,201 @@ from PyQt5.QtWidgets import (
 )
 
 from course_dock import CourseInfoDock
-from data_model import CellDescriptor, CourseDataModel, MatrixData
-from filter_dialog import FilterDialog
+from data_model import CourseDataModel, MatrixData
 from student_dock import StudentInfoDock
 
+# Cell background brushes indexed by completion age bucket (see _age_buckets),
+# built once and shared by every cell.
+_BRUSH_TABLE = tuple(
+    QBrush(QColor(rgb))
+    for rgb in (
+        0xE0E0E0,  # gray: no completion date
+        0x90EE90,  # light green: <= 30 days
+        0xFFFF99,  # light yellow: <= 180 days
+        0xFFCC99,  # light orange: <= 365 days
+        0xFFA0A0,  # light red: older
+    )
+)
+
+# Qt asks data() for every role of every visible cell; only these are answered.
+_CELL_ROLES = frozenset((Qt.DisplayRole, Qt.BackgroundRole, Qt.ToolTipRole))
+
+
+class _MatrixQtModel(QAbstractTableModel):
+    """Qt view of a MatrixData; data() reads the precomputed per-cell grids."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._matrix: MatrixData = MatrixData([], [])
+        self._row_count = 0
+        self._course_labels: list[str] = []
+        self._student_labels: list[str] = []
+        self._today_normalized = pd.Timestamp.today().normalize()
+        self._brush_table = _BRUSH_TABLE
+        self._bucket: np.ndarray = np.zeros((0, 0), dtype=np.int8)
+        self._has_cell: np.ndarray = np.zeros((0, 0), dtype=bool)
+        self._text_index: np.ndarray = np.zeros((0, 0), dtype=np.int32)
+        self._display_texts: list[str] = []
+        self._tooltip_texts: list[str] = []
+
+    # Qt API ------------------------------------------------------------
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # type: ignore[override]
+        if parent.isValid():
+            return 0
+        return self._row_count
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:  # type: ignore[override]
+        if parent.isValid():
+            return 0
+        return len(self._matrix.courses)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):  # type: ignore[override]
+        if role not in _CELL_ROLES or not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == Qt.BackgroundRole:
+            return self._brush_table[self._bucket[row, column]]
+        if not self._has_cell[row, column]:
+            return None
+        text_index = self._text_index[row, column]
+        if role == Qt.DisplayRole:
+            return self._display_texts[text_index]
+        return self._tooltip_texts[text_index]
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):  # type: ignore[override]
+        if role != Qt.DisplayRole:
+            return None
+        labels = self._course_labels if orientation == Qt.Horizontal else self._student_labels
+        if 0 <= section < len(labels):
+            return labels[section]
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:  # type: ignore[override]
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    # Public API --------------------------------------------------------
+    @property
+    def matrix(self) -> MatrixData:
+        return self._matrix
+
+    def column_text_widths(self, metrics: QFontMetrics, padding: int) -> np.ndarray:
+        """Widest cell text per column, in pixels including padding.
+
+        Each distinct text is measured once; the per-column maximum is taken
+        over the index grid, so no cell is queried through data().
+        """
+        text_widths = np.array([metrics.horizontalAdvance(text) + padding for text in self._display_texts])
+        return np.where(self._has_cell, text_widths[self._text_index], 0).max(axis=0)
+
+    # Updates -----------------------------------------------------------
+    def set_matrix(self, matrix: MatrixData) -> None:
+        old_rows, old_columns = len(self._matrix.students), len(self._matrix.courses)
+        new_rows, new_columns = len(matrix.students), len(matrix.courses)
+
+        # A reset drops every cached geometry and re-queries all cells; when only
+        # the student rows change (e.g. a new filter), report just that.
+        if new_columns != old_columns or not new_columns or not old_rows or not new_rows:
+            self.beginResetModel()
+            self._install_matrix(matrix)
+            self._row_count = new_rows
+            self.endResetModel()
+            return
+
+        # Removed rows go first while the old grids still back the remaining ones;
+        # inserted rows come last, once the new (larger) grids are in place.
+        if new_rows < old_rows:
+            self.beginRemoveRows(QModelIndex(), new_rows, old_rows - 1)
+            self._row_count = new_rows
+            self.endRemoveRows()
+
+        self._install_matrix(matrix)
+        changed_rows = min(old_rows, new_rows)
+        self.dataChanged.emit(
+            self.index(0, 0),
+            self.index(changed_rows - 1, new_columns - 1),
+            [Qt.DisplayRole, Qt.BackgroundRole, Qt.ToolTipRole],
+        )
+        self.headerDataChanged.emit(Qt.Vertical, 0, changed_rows - 1)
+        self.headerDataChanged.emit(Qt.Horizontal, 0, new_columns - 1)
+
+        if new_rows > old_rows:
+            self.beginInsertRows(QModelIndex(), old_rows, new_rows - 1)
+            self._row_count = new_rows
+            self.endInsertRows()
+
+    def _install_matrix(self, matrix: MatrixData) -> None:
+        self._matrix = matrix
+        self._course_labels = [course.label for course in matrix.courses]
+        self._student_labels = [student.label for student in matrix.students]
+        self._today_normalized = pd.Timestamp.today().normalize()
+        self._bucket = self._age_buckets(matrix.completion, self._today_normalized)
+        self._has_cell = matrix.cells.astype(bool)
+        self._text_index, self._display_texts, self._tooltip_texts = self._cell_texts(matrix)
+
+    # Helpers -----------------------------------------------------------
+    @staticmethod
+    def _age_buckets(completion: np.ndarray, today: pd.Timestamp) -> np.ndarray:
+        """Classify every cell once: 0 = no date, 1-4 = increasingly old."""
+        # Whole days in any datetime64 unit; the cast to [D] floors, which is
+        # what Timestamp.normalize() does for naive timestamps.
+        has_date = ~np.isnat(completion)
+        completion_days = completion.astype("datetime64[D]").view("i8")
+        today_days = np.datetime64(today.date(), "D").view("i8")
+        days_ago = np.maximum(0, today_days - completion_days)
+        buckets = np.select(
+            [~has_date, days_ago <= 30, days_ago <= 180, days_ago <= 365],
+            [0, 1, 2, 3],
+            default=4,
+        )
+        return buckets.astype(np.int8)
+
+    @staticmethod
+    def _cell_texts(matrix: MatrixData) -> Tuple[np.ndarray, list[str], list[str]]:
+        """Format display and tooltip strings once, per distinct completion date.
+
+        Returns an int32 grid of indices into the two string tables; index 0
+        is a cell without a completion date.
+        """
+        completion = matrix.completion
+        has_date = ~np.isnat(completion)
+        unique_dates, inverse = np.unique(completion[has_date], return_inverse=True)
+        labels = pd.DatetimeIndex(unique_dates).strftime("%Y-%m-%d").tolist()
+
+        text_index = np.zeros(completion.shape, dtype=np.int32)
+        text_index[has_date] = inverse + 1
+        display_texts = [""] + labels
+        tooltip_texts = ["No completion date recorded"] + [f"Completed on {label}" for label in labels]
+        return text_index, display_texts, tooltip_texts
+
 
 class MatrixTableModel:
     """Qt table model adapter for the matrix data."""
 
     def __init__(self, data_model: CourseDataModel) -> None:
-        from PyQt5.QtCore import QAbstractTableModel
-
-        class _Model(QAbstractTableModel):
-            def __init__(self, outer: "MatrixTableModel") -> None:
-                super().__init__()
-                self._outer = outer
-
-            # Qt API -----------------------------------------------------
-            def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # type: ignore[override]
-                if parent.isValid():
-                    return 0
-                return len(self._outer._matrix.students)
-
-            def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:  # type: ignore[override]
-                if parent.isValid():
-                    return 0
-                return len(self._outer._matrix.courses)
-
-            def data(self, index: QModelIndex, role: int = Qt.DisplayRole):  # type: ignore[override]
-                if not index.isValid():
-                    return None
-                cell = self._outer._matrix.cell_lookup.get((index.row(), index.column()))
-                if role == Qt.DisplayRole and cell is not None:
-                    if cell.completion_date is not None and not pd.isna(cell.completion_date):
-                        return pd.Timestamp(cell.completion_date).strftime("%Y-%m-%d")
-                    return ""
-                if role == Qt.BackgroundRole:
-                    return self._outer._background_brush(cell)
-                if role == Qt.ToolTipRole and cell is not None:
-                    if cell.completion_date is not None:
-                        timestamp = pd.Timestamp(cell.completion_date)
-                        return f"Completed on {timestamp:%Y-%m-%d}"
-                    return "No completion date recorded"
-                return None
-
-            def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):  # type: ignore[override]
-                if role != Qt.DisplayRole:
-                    return None
-                if orientation == Qt.Horizontal:
-                    if 0 <= section < len(self._outer._matrix.courses):
-                        return self._outer._matrix.courses[section].label
-                else:
-                    if 0 <= section < len(self._outer._matrix.students):
-                        return self._outer._matrix.students[section].label
-                return None
-
-            def flags(self, index: QModelIndex) -> Qt.ItemFlags:  # type: ignore[override]
-                if not index.isValid():
-                    return Qt.NoItemFlags
-                return Qt.ItemIsEnabled | Qt.ItemIsSelectable
-
         self._data_model = data_model
-        self._matrix: MatrixData = MatrixData([], [], {})
-        self._qt_model = _Model(self)
+        self._qt_model = _MatrixQtModel()
 
     # Public API --------------------------------------------------------
-    def qt_model(self):
+    def qt_model(self) -> _MatrixQtModel:
         return self._qt_model
 
-    def update_matrix(self, matrix: MatrixData) -> None:
-        self._qt_model.beginResetModel()
-        self._matrix = matrix
-        self._qt_model.endResetModel()
+    @property
+    def matrix(self) -> MatrixData:
+        return self._qt_model.matrix
 
-    # Helpers -----------------------------------------------------------
-    @staticmethod
-    def _background_brush(cell: Optional[CellDescriptor]) -> Optional[QBrush]:
-        if cell is None or cell.completion_date is None or pd.isna(cell.completion_date):
-            return QBrush(QColor(224, 224, 224))
-
-        completion = pd.Timestamp(cell.completion_date).normalize()
-        today = pd.Timestamp.today().normalize()
-        days_ago = max(0, int((today - completion).days))
-        if days_ago <= 30:
-            color = QColor(144, 238, 144)  # light green
-        elif days_ago <= 180:
-            color = QColor(255, 255, 153)  # light yellow
-        elif days_ago <= 365:
-            color = QColor(255, 204, 153)  # light orange
-        else:
-            color = QColor(255, 160, 160)  # light red
-        return QBrush(color)
+    def update_matrix(self, matrix: MatrixData) -> None:
+        self._qt_model.set_matrix(matrix)
 
 
 class MainWindow(QMainWindow):
+    COLUMN_PADDING = 8
+    # Categorical filter columns list at most this many values; above the
+    # cardinality limit the filter dialog falls back to free-text input.
+    FILTER_VALUES_LIMIT = 500
+    FILTER_CARDINALITY_LIMIT = 10_000
+
     def __init__(self) -> None:
         super().__init__()
         self.setWindowTitle("Course Matrix")
@@ -166,6 +268,10 @@ class MainWindow(QMainWindow):
         self.table_view.setModel(self.table_model.qt_model())
         self.table_view.setSelectionMode(QTableView.SingleSelection)
         self.table_view.setSelectionBehavior(QTableView.SelectItems)
+        # Cells hold short dates; skip per-cell text layout work while painting.
+        self.table_view.setWordWrap(False)
+        self.table_view.setTextElideMode(Qt.ElideRight)
+        self.table_view.setAlternatingRowColors(False)
         
         # --- CRITICAL FIX START ---
         # Allow headers to shrink to 0 pixels (removes the ~20px limit)
@@ -179,6 +285,7 @@ class MainWindow(QMainWindow):
         self.table_view.viewport().installEventFilter(self)
         self.table_view.installEventFilter(self)
         self._base_column_widths: list[int] = []
+        self._base_column_widths_total = 0
         layout.addWidget(self.table_view)
 
         self._zoom_factor = 1.0
@@ -187,8 +294,23 @@ class MainWindow(QMainWindow):
         self._ABSOLUTE_MIN_ZOOM = 0.0001  # Allow extremely small zoom
         self._base_font_size = self.table_view.font().pointSizeF()
         self._base_row_height = self.table_view.verticalHeader().defaultSectionSize()
+        self._fit_zoom: float | None = None
+        self._fit_zoom_valid = False
         self._apply_zoom()
 
+        # Refit once the user stops resizing instead of on every resize event.
+        self._refit_timer = QTimer(self)
+        self._refit_timer.setSingleShot(True)
+        self._refit_timer.setInterval(75)
+        self._refit_timer.timeout.connect(self._fit_table_in_view)
+
+        # Ctrl+wheel steps are accumulated and applied in one zoom per frame.
+        self._pending_zoom_steps = 0
+        self._wheel_timer = QTimer(self)
+        self._wheel_timer.setSingleShot(True)
+        self._wheel_timer.setInterval(16)
+        self._wheel_timer.timeout.connect(self._flush_wheel_zoom)
+
         status_bar = QStatusBar(self)
         self.setStatusBar(status_bar)
         self.status_label = QLabel("Load student and course files to begin.")
@@ -241,6 +363,8 @@ class MainWindow(QMainWindow):
             self._show_error("Load students first", "Please load a student Excel file before filtering.")
             return
 
+        from filter_dialog import FilterDialog  # loaded on first use
+
         columns, values_by_column = self._gather_filter_metadata()
         dialog = FilterDialog(columns, values_by_column, self.data_model.filters, self)
         if dialog.exec_():
@@ -250,16 +374,13 @@ class MainWindow(QMainWindow):
     def on_selection_changed(self, selected: QItemSelection, _: QItemSelection) -> None:
         if selected.indexes():
             index = selected.indexes()[0]
-            cell = self.table_model._matrix.cell_lookup.get((index.row(), index.column()))
+            cell = self.table_model.matrix.cells[index.row(), index.column()]
             if cell is None:
                 self.student_dock.clear()
                 self.course_dock.clear()
             else:
                 self.student_dock.show_student_rows(cell.student_rows)
-                if cell.course.course_row is not None:
-                    self.course_dock.show_course(cell.course.course_row)
-                else:
-                    self.course_dock.clear()
+                self.course_dock.show_course(cell.course.course_row)
         else:
             self.student_dock.clear()
             self.course_dock.clear()
@@ -276,9 +397,9 @@ class MainWindow(QMainWindow):
         matrix = self.data_model.build_matrix()
         self.table_model.update_matrix(matrix)
         self.table_view.clearSelection()
-        self.table_view.resizeColumnsToContents()
-        self.table_view.resizeRowsToContents()
+        self._size_columns_from_texts()
         self._record_base_column_widths()
+        self._fit_zoom_valid = False
         self._fit_table_in_view()
         self.student_dock.clear()
         self.course_dock.clear()
@@ -303,6 +424,17 @@ class MainWindow(QMainWindow):
         self._update_min_zoom()
         self._zoom_factor = min(self._max_zoom_factor, max(self._min_zoom_factor, self._zoom_factor))
 
+        # Apply fonts, row height and every column width as one batch so the
+        # view repaints once instead of once per column.
+        self.table_view.setUpdatesEnabled(False)
+        try:
+            self._scale_table()
+        finally:
+            self.table_view.setUpdatesEnabled(True)
+
+        self.zoom_label.setText(f"{self._zoom_factor * 100:.1f}%")
+
+    def _scale_table(self) -> None:
         # 1. Scale Font
         # Note: Qt font rendering can be unstable below 1pt, but we set it anyway.
         font_size = max(0.5, self._base_font_size * self._zoom_factor)
@@ -328,10 +460,11 @@ class MainWindow(QMainWindow):
         # 3. Scale Columns
         if self._base_column_widths:
             # We must set resize mode to Interactive or Fixed to allow manual setting
-            self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+            header = self.table_view.horizontalHeader()
+            header.setSectionResizeMode(QHeaderView.Interactive)
             for col, width in enumerate(self._base_column_widths):
                 scaled_width = max(1, int(round(width * self._zoom_factor)))
-                self.table_view.setColumnWidth(col, scaled_width)
+                header.resizeSection(col, scaled_width)
 
         # 4. Hide Grid at small scales
         # If pixels are too small, grid lines (which are 1px) will turn the view gray.
@@ -340,21 +473,38 @@ class MainWindow(QMainWindow):
         else:
             self.table_view.setShowGrid(True)
 
-        self.zoom_label.setText(f"{self._zoom_factor * 100:.1f}%")
-
   
 
+    def _size_columns_from_texts(self) -> None:
+        """Size columns from the header and the cached cell texts.
+
+        resizeColumnsToContents() queries the model for every cell; the model
+        measures its small table of distinct date texts instead. Row heights
+        are fixed by _apply_zoom and need no measuring.
+        """
+        matrix = self.table_model.matrix
+        if not matrix.courses or not matrix.students:
+            return
+
+        cell_widths = self.table_model.qt_model().column_text_widths(
+            self.table_view.fontMetrics(), self.COLUMN_PADDING
+        )
+        header = self.table_view.horizontalHeader()
+        for column, cell_width in enumerate(cell_widths.tolist()):
+            self.table_view.setColumnWidth(column, max(header.sectionSizeHint(column), cell_width))
+
     def _record_base_column_widths(self) -> None:
-        column_count = len(self.table_model._matrix.courses)
+        column_count = len(self.table_model.matrix.courses)
         self._base_column_widths = [self.table_view.columnWidth(i) for i in range(column_count)]
+        self._base_column_widths_total = sum(self._base_column_widths)
 
     def _compute_fit_zoom(self) -> float | None:
         viewport = self.table_view.viewport()
         
         # Calculate total rows and columns
         # Note: We use the matrix directly as the model returns 0 if parent is valid
-        rows = len(self.table_model._matrix.students)
-        cols = len(self.table_model._matrix.courses)
+        rows = len(self.table_model.matrix.students)
+        cols = len(self.table_model.matrix.courses)
 
         fit_candidates: list[float] = []
         
@@ -369,7 +519,7 @@ class MainWindow(QMainWindow):
 
         # 2. Calculate horizontal fit
         if self._base_column_widths and viewport.width() > 0:
-            total_base_width = sum(self._base_column_widths)
+            total_base_width = self._base_column_widths_total
             if total_base_width > 0:
                 math_fit = viewport.width() / total_base_width
                 fit_candidates.append(math_fit)
@@ -384,14 +534,21 @@ class MainWindow(QMainWindow):
         # Ensure we don't go below floating point stability or 0
         return min(max(self._ABSOLUTE_MIN_ZOOM, target_zoom), self._max_zoom_factor)
 
+    def _cached_fit_zoom(self) -> float | None:
+        # Only the matrix contents and the window size change the fit zoom.
+        if not self._fit_zoom_valid:
+            self._fit_zoom = self._compute_fit_zoom()
+            self._fit_zoom_valid = True
+        return self._fit_zoom
+
     def _update_min_zoom(self) -> None:
-        fit_zoom = self._compute_fit_zoom()
+        fit_zoom = self._cached_fit_zoom()
         if fit_zoom is None:
             return
         self._min_zoom_factor = max(self._ABSOLUTE_MIN_ZOOM, min(fit_zoom, 1.0))
 
     def _fit_table_in_view(self) -> None:
-        fit_zoom = self._compute_fit_zoom()
+        fit_zoom = self._cached_fit_zoom()
         if fit_zoom is None:
             return
         self._zoom_factor = min(self._zoom_factor, fit_zoom)
@@ -409,26 +566,35 @@ class MainWindow(QMainWindow):
             value_type = self._infer_value_type(series)
             columns[column] = value_type
             if value_type == "categorical":
-                unique_values = series.dropna().unique().tolist()
-                values_by_column[column] = sorted(unique_values, key=lambda v: str(v))[:500]
+                counts = series.value_counts(dropna=True)
+                counts = counts[counts > 0]  # unobserved categories
+                if len(counts) > self.FILTER_CARDINALITY_LIMIT:
+                    continue
+                top_values = counts.head(self.FILTER_VALUES_LIMIT).index.tolist()
+                values_by_column[column] = sorted(top_values, key=lambda v: str(v))
 
         return columns, values_by_column
 
     @staticmethod
     def _infer_value_type(series: pd.Series) -> str:
+        # Decide on dtype first; only object/string columns need parsing, and
+        # then only on a small sample of the non-null values.
         if pd.api.types.is_datetime64_any_dtype(series):
             return "date"
-
-        parsed_dates = pd.to_datetime(series, errors="coerce")
-        if parsed_dates.notna().sum() > 0:
-            non_na_ratio = parsed_dates.notna().mean()
-            if non_na_ratio >= 0.2:
-                return "date"
-
+        if pd.api.types.is_bool_dtype(series) or isinstance(series.dtype, pd.CategoricalDtype):
+            return "categorical"
         if pd.api.types.is_numeric_dtype(series):
             return "numeric"
 
-        numeric_coerced = pd.to_numeric(series, errors="coerce")
+        sample = series.dropna().head(200)
+        if sample.empty:
+            return "categorical"
+
+        parsed_dates = pd.to_datetime(sample, errors="coerce")
+        if parsed_dates.notna().mean() >= 0.2:
+            return "date"
+
+        numeric_coerced = pd.to_numeric(sample, errors="coerce")
         if numeric_coerced.notna().any():
             return "numeric"
 
@@ -437,15 +603,28 @@ class MainWindow(QMainWindow):
 
     def resizeEvent(self, event):  # type: ignore[override]
         super().resizeEvent(event)
-        self._fit_table_in_view()
+        self._fit_zoom_valid = False
+        self._refit_timer.start()
 
     def eventFilter(self, obj, event):  # type: ignore[override]
         if event.type() == QEvent.Wheel and event.modifiers() & Qt.ControlModifier:
             delta = event.angleDelta().y()
-            self._adjust_zoom(0.1 if delta > 0 else -0.1)
+            self._pending_zoom_steps += 1 if delta > 0 else -1
+            # Arm only when idle: restarting on every event would hold the zoom
+            # back until the gesture ends instead of applying it each frame.
+            if not self._wheel_timer.isActive():
+                self._wheel_timer.start()
             return True
+        if event.type() == QEvent.Resize and obj is self.table_view.viewport():
+            # Docks and scrollbars resize the viewport without resizing the window.
+            self._fit_zoom_valid = False
         return super().eventFilter(obj, event)
 
+    def _flush_wheel_zoom(self) -> None:
+        steps, self._pending_zoom_steps = self._pending_zoom_steps, 0
+        if steps:
+            self._adjust_zoom(0.1 * steps)
+
 
 def run() -> None:
     import sys
@@ -1,11 +1,20 @@
 from __future__ import annotations
 
+from html import escape
 from typing import Optional
 
 import pandas as pd
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QDockWidget, QTextBrowser
 
+from course_dock import value_text
+
+_STYLE_SHEET = (
+    "table { width: 100%; border-collapse: collapse; }"
+    "th { text-align: left; padding: 4px; border-bottom: 1px solid #ccc; }"
+    "td { padding: 4px; border-bottom: 1px solid #ccc; }"
+)
+
 
 class StudentInfoDock(QDockWidget):
     """Dock widget that renders the student information for a selection."""
@@ -15,6 +24,7 @@ class StudentInfoDock(QDockWidget):
         self.setAllowedAreas(Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea)
         self._browser = QTextBrowser(self)
         self._browser.setOpenExternalLinks(True)
+        self._browser.document().setDefaultStyleSheet(_STYLE_SHEET)
         self.setWidget(self._browser)
         self.clear()
 
@@ -26,17 +36,12 @@ class StudentInfoDock(QDockWidget):
             self.clear()
             return
 
+        headers = [f"<tr><th>{escape(str(column))}</th><td>" for column in rows.columns]
         html_parts = ["<h3>Student record</h3>"]
-        for idx, (_, row) in enumerate(rows.iterrows(), start=1):
-            html_parts.append(f"<h4>Entry {idx}</h4>")
-            html_parts.append("<table style='width:100%; border-collapse: collapse;'>")
-            for column, value in row.items():
-                value_str = "" if pd.isna(value) else str(value)
-                html_parts.append(
-                    "<tr>"
-                    f"<th style='text-align:left; padding:4px; border-bottom:1px solid #ccc;'>{column}</th>"
-                    f"<td style='padding:4px; border-bottom:1px solid #ccc;'>{value_str}</td>"
-                    "</tr>"
-                )
+        for idx, values in enumerate(rows.to_numpy(dtype=object), start=1):
+            html_parts.append(f"<h4>Entry {idx}</h4><table>")
+            html_parts.extend(
+                f"{header}{escape(value_text(value))}</td></tr>" for header, value in zip(headers, values)
+            )
             html_parts.append("</table>")
-        self._browser.setHtml("\n".join(html_parts))
\ No newline at end of file
+        self._browser.setHtml("".join(html_parts))